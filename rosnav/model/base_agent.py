@@ -33,6 +33,13 @@ class BaseAgent(ABC):
 
     """
 
+    # Names of BASE_AGENT_ATTR declared by the agent, collected once per subclass
+    _kwarg_keys: tuple = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._kwarg_keys = tuple(key for key in BASE_AGENT_ATTR if hasattr(cls, key))
+
     @property
     def space_encoder_class(self) -> Type[BaseSpaceEncoder]:
         """
@@ -133,11 +140,10 @@ class BaseAgent(ABC):
             dict: Keyword arguments for the agent.
         """
         kwargs = {}
-        for key in self.__dir__():
-            if key in BASE_AGENT_ATTR:
-                val = getattr(self, key)
-                if val is not None:
-                    kwargs[key] = val
+        for key in type(self)._kwarg_keys:
+            val = getattr(self, key)
+            if val is not None:
+                kwargs[key] = val
 
         update_features_extractor_kwargs(
             kwargs["features_extractor_kwargs"], observation_space_manager, stack_size
@@ -161,5 +167,12 @@ def update_features_extractor_kwargs(
     Returns:
         None
     """
+    if (
+        features_extractor_kwargs.get("observation_space_manager")
+        is observation_space_manager
+        and features_extractor_kwargs.get("stack_size") == stacked
+    ):
+        return
+
     features_extractor_kwargs["observation_space_manager"] = observation_space_manager
     features_extractor_kwargs["stack_size"] = stacked
@@ -1,5 +1,6 @@
+import inspect
 from abc import ABC, abstractmethod
-from typing import Dict, Union
+from typing import IO, Dict, Iterable, Union
 
 import rosnav.utils.observation_space as SPACE
 import torch as th
@@ -8,6 +9,7 @@ from rosnav.utils.observation_space.observation_space_manager import (
     ObservationSpaceManager,
 )
 from stable_baselines3.common.policies import BaseFeaturesExtractor
+from torch import nn
 
 TensorDict = Dict[str, th.Tensor]
 
@@ -78,3 +80,91 @@ class RosnavBaseExtractor(BaseFeaturesExtractor, ABC):
             th.Tensor: The extracted features.
         """
         raise NotImplementedError
+
+    def to_scripted(self, observations: TensorDict) -> th.jit.ScriptModule:
+        """
+        Trace, freeze and optimize the feature extractor for inference with TorchScript.
+
+        The extractor is traced rather than scripted, since preparing the inputs iterates
+        over the observation space manager. Tracing bakes these lookups into the graph,
+        freezing inlines the weights and ``optimize_for_inference`` folds remaining batch
+        norms. The result must not be trained.
+
+        Args:
+            observations (TensorDict): Preprocessed example observations, e.g. a sampled observation.
+
+        Returns:
+            th.jit.ScriptModule: The optimized feature extractor.
+        """
+        traced = th.jit.trace(self.eval(), (observations,), strict=False)
+        return th.jit.optimize_for_inference(th.jit.freeze(traced))
+
+    def export_onnx(
+        self,
+        f: Union[str, IO[bytes]],
+        observations: TensorDict,
+        opset_version: int = 17,
+    ):
+        """
+        Export the feature extractor to ONNX, e.g. to run it with ONNX Runtime.
+
+        The observation keys become the input names of the model and the batch
+        dimension is exported as dynamic axis.
+
+        Args:
+            f (Union[str, IO[bytes]]): The path or file-like object to write the model to.
+            observations (TensorDict): Preprocessed example observations, e.g. a sampled observation.
+            opset_version (int, optional): The ONNX opset version. Defaults to 17.
+        """
+        dynamic_axes = {key: {0: "batch"} for key in observations}
+        dynamic_axes["features"] = {0: "batch"}
+
+        export_kwargs = {}
+        if "dynamo" in inspect.signature(th.onnx.export).parameters:
+            # the TorchScript based exporter supports dict inputs and dynamic_axes
+            export_kwargs["dynamo"] = False
+
+        th.onnx.export(
+            self.eval(),
+            # a trailing dict would be passed as keyword arguments
+            (observations, {}),
+            f,
+            input_names=list(observations),
+            output_names=["features"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset_version,
+            **export_kwargs,
+        )
+
+    def to_quantized(self, calibration_observations: Iterable[TensorDict]) -> nn.Module:
+        """
+        Quantize the feature extractor to INT8 with FX graph mode post-training quantization.
+
+        Batch norms are folded and Conv-ReLU pairs fused while preparing the graph, the
+        activation ranges are calibrated on the given observations. The quantized module
+        only runs on the CPU and must not be trained.
+
+        Args:
+            calibration_observations (Iterable[TensorDict]): Preprocessed observations to calibrate
+                the activation ranges on. The first one is used as example input for tracing.
+
+        Returns:
+            nn.Module: The quantized feature extractor.
+        """
+        # deprecated in recent PyTorch releases in favor of torchao, only import on use
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+        calibration_observations = iter(calibration_observations)
+        example_observations = next(calibration_observations)
+
+        prepared = prepare_fx(
+            self.eval(),
+            get_default_qconfig_mapping("x86"),
+            example_inputs=(example_observations,),
+        )
+        with th.no_grad():
+            prepared(example_observations)
+            for observations in calibration_observations:
+                prepared(observations)
+        return convert_fx(prepared)
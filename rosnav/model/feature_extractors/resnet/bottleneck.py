@@ -1,7 +1,7 @@
 import torch
 from torch import nn
 
-from .utils import conv1x1, conv3x3
+from .utils import add_relu_, conv1x1, conv3x3
 
 
 class Bottleneck(nn.Module):
@@ -98,7 +98,6 @@ class Bottleneck(nn.Module):
         if self.downsample is not None:
             identity = self.downsample(x)
 
-        out += identity
-        out = self.relu(out)
+        out = add_relu_(out, identity)
 
         return out
@@ -15,8 +15,7 @@ Details:
         batch normalization operations, followed by fusion and goal networks to extract features.
 """
 
-from copy import deepcopy
-from typing import List, Callable, Tuple
+from typing import List, Callable, Optional, Tuple
 
 import gymnasium as gym
 from gymnasium.spaces.box import Box
@@ -31,7 +30,15 @@ import rosnav.utils.observation_space as SPACE
 
 from ..base_extractor import RosnavBaseExtractor, TensorDict
 from .bottleneck import Bottleneck
-from .utils import conv1x1, conv3x3
+from .utils import (
+    add_relu_,
+    bottleneck_branch,
+    conv1x1,
+    conv3x3,
+    downsample_branch,
+    fuse_conv_bn,
+    fuse_conv_relu,
+)
 
 __all__ = [
     "RESNET_MID_FUSION_EXTRACTOR_1",
@@ -57,6 +64,7 @@ class RESNET_MID_FUSION_EXTRACTOR_1(RosnavBaseExtractor):
         width_per_group (int, optional): The width of each group in the ResNet architecture. Defaults to 64.
         replace_stride_with_dilation (List[bool], optional): Whether to replace stride with dilation in each block of the ResNet architecture. Defaults to None.
         norm_layer (nn.Module, optional): The normalization layer to use in the ResNet architecture. Defaults to nn.BatchNorm2d.
+        use_stem_maxpool (bool, optional): Whether to apply the stride-1 3x3 max pooling after the stem convolution. It does not change the feature map size. Defaults to True.
     """
 
     REQUIRED_OBSERVATIONS = [
@@ -79,6 +87,7 @@ class RESNET_MID_FUSION_EXTRACTOR_1(RosnavBaseExtractor):
         width_per_group: int = 64,
         replace_stride_with_dilation: List[bool] = None,
         norm_layer: nn.Module = nn.BatchNorm2d,
+        use_stem_maxpool: bool = True,
         *arg,
         **kwargs,
     ):
@@ -89,11 +98,13 @@ class RESNET_MID_FUSION_EXTRACTOR_1(RosnavBaseExtractor):
         self._replace_stride_with_dilation = replace_stride_with_dilation
         self._norm_layer = norm_layer
         self._zero_init_residual = zero_init_residual
+        self._use_stem_maxpool = use_stem_maxpool
 
         self._observation_space_manager = observation_space_manager
 
         self._num_pedestrian_feature_maps = self._get_num_pedestrian_feature_maps()
         self._get_input_sizes()
+        self._get_input_keys()
 
         super(RESNET_MID_FUSION_EXTRACTOR_1, self).__init__(
             observation_space=observation_space,
@@ -153,6 +164,25 @@ class RESNET_MID_FUSION_EXTRACTOR_1(RosnavBaseExtractor):
             if "PEDESTRIAN" in obs.name:
                 self._ped_map_size += self._observation_space_manager[obs].shape[-1]
 
+    def _get_input_keys(self):
+        """
+        Resolve the observation keys read by ``_get_input`` once, instead of on every forward pass.
+
+        Returns:
+            None
+        """
+        self._goal_key = (
+            SPACE.DistAngleToSubgoalSpace.name
+            if SPACE.DistAngleToSubgoalSpace in self._observation_space_manager
+            else SPACE.SubgoalInRobotFrameSpace.name
+        )
+        self._ped_keys = [
+            space.name
+            for space in self._observation_space_manager.space_list
+            if "PEDESTRIAN" in space.name
+        ]
+        self._has_last_action = SPACE.LastActionSpace in self._observation_space_manager
+
     def _setup_network(self, inplanes: int = 64):
         """
         Sets up the network architecture for feature extraction.
@@ -183,7 +213,11 @@ class RESNET_MID_FUSION_EXTRACTOR_1(RosnavBaseExtractor):
         )
         self.bn1 = self._norm_layer(self.inplanes)
         self.relu = nn.ReLU(inplace=True)
-        self.maxpool = nn.MaxPool2d(kernel_size=3, stride=1, padding=1)
+        self.maxpool = (
+            nn.MaxPool2d(kernel_size=3, stride=1, padding=1)
+            if self._use_stem_maxpool
+            else nn.Identity()
+        )
         self.layer1 = self._make_layer(self._block, 64, self._layers[0])
         self.layer2 = self._make_layer(
             self._block,
@@ -200,85 +234,11 @@ class RESNET_MID_FUSION_EXTRACTOR_1(RosnavBaseExtractor):
             dilate=self._replace_stride_with_dilation[1],
         )
 
-        self.conv2_2 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=256,
-                out_channels=128,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(128),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=128,
-                out_channels=128,
-                kernel_size=(3, 3),
-                stride=(1, 1),
-                padding=(1, 1),
-            ),
-            nn.BatchNorm2d(128),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=128,
-                out_channels=256,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(256),
-        )
-        self.downsample2 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=128,
-                out_channels=256,
-                kernel_size=(1, 1),
-                stride=(2, 2),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(256),
-        )
-        self.relu2 = nn.ReLU(inplace=True)
-
-        self.conv3_2 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=512,
-                out_channels=256,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(256),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=256,
-                out_channels=256,
-                kernel_size=(3, 3),
-                stride=(1, 1),
-                padding=(1, 1),
-            ),
-            nn.BatchNorm2d(256),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=256,
-                out_channels=512,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(512),
-        )
-        self.downsample3 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=64,
-                out_channels=512,
-                kernel_size=(1, 1),
-                stride=(4, 4),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(512),
-        )
-        self.relu3 = nn.ReLU(inplace=True)
+        self.conv2_2 = bottleneck_branch(256, 128, 256)
+        self.downsample2 = downsample_branch(128, 256, 2)
+
+        self.conv3_2 = bottleneck_branch(512, 256, 512)
+        self.downsample3 = downsample_branch(64, 512, 4)
 
         # self.layer4 = self._make_layer(block, 512, layers[3], stride=2,
         #                               dilate=replace_stride_with_dilation[2])
@@ -304,25 +264,25 @@ class RESNET_MID_FUSION_EXTRACTOR_1(RosnavBaseExtractor):
         Returns:
             None
         """
+        # Zero-initialize the last BN in each residual branch,
+        # so that the residual branch starts with zeros, and each residual block behaves like an identity.
+        # This improves the model by 0.2~0.3% according to https://arxiv.org/abs/1706.02677
+        # Blocks are visited before their children, so their bn3 is collected in time.
+        zero_init_norms = set()
+
         for m in self.modules():
             if isinstance(m, nn.Conv2d):
                 nn.init.kaiming_normal_(m.weight, mode="fan_out", nonlinearity="relu")
             elif isinstance(m, (nn.BatchNorm2d, nn.GroupNorm)):
-                nn.init.constant_(m.weight, 1)
+                nn.init.constant_(m.weight, 0 if m in zero_init_norms else 1)
                 nn.init.constant_(m.bias, 0)
             elif isinstance(m, nn.BatchNorm1d):  # add by xzt
                 nn.init.constant_(m.weight, 1)
                 nn.init.constant_(m.bias, 0)
             elif isinstance(m, nn.Linear):
                 nn.init.xavier_normal_(m.weight)
-
-        # Zero-initialize the last BN in each residual branch,
-        # so that the residual branch starts with zeros, and each residual block behaves like an identity.
-        # This improves the model by 0.2~0.3% according to https://arxiv.org/abs/1706.02677
-        if self._zero_init_residual:
-            for m in self.modules():
-                if isinstance(m, Bottleneck):
-                    nn.init.constant_(m.bn3.weight, 0)
+            elif isinstance(m, Bottleneck) and self._zero_init_residual:
+                zero_init_norms.add(m.bn3)
 
     def _make_layer(
         self,
@@ -423,18 +383,18 @@ class RESNET_MID_FUSION_EXTRACTOR_1(RosnavBaseExtractor):
         x = self.layer2(x)
 
         x = self.conv2_2(x)
-        x += identity2
-        x = self.relu2(x)
+        x = add_relu_(x, identity2)
+        del identity2
 
         x = self.layer3(x)
         # x = self.layer4(x)
 
         x = self.conv3_2(x)
-        x += identity3
-        x = self.relu3(x)
+        x = add_relu_(x, identity3)
+        del identity3
 
         x = self.avgpool(x)
-        fusion_out = x.squeeze(-1).squeeze(-1)
+        fusion_out = x.flatten(1)
         ###### End of fusion net ######
 
         ###### Start of goal net #######
@@ -458,26 +418,16 @@ class RESNET_MID_FUSION_EXTRACTOR_1(RosnavBaseExtractor):
         laser_map = observations[SPACE.StackedLaserMapSpace.name].unsqueeze(
             1
         )  # (num_envs, 1, 80, 80)
-
-        goal_key = (
-            SPACE.DistAngleToSubgoalSpace.name
-            if SPACE.DistAngleToSubgoalSpace.name in observations
-            else SPACE.SubgoalInRobotFrameSpace.name
-        )
-        dist_angle_to_goal = observations[goal_key].squeeze(1)  # (num_envs, 2)
+        dist_angle_to_goal = observations[self._goal_key].squeeze(1)  # (num_envs, 2)
 
         ped_map = None
-        if self.num_pedestrian_feature_maps > 0:
+        if self._ped_keys:
             ped_map = torch.stack(
-                [
-                    observations[space.name]
-                    for space in self._observation_space_manager.space_list
-                    if "PEDESTRIAN" in space.name
-                ],
+                [observations[key] for key in self._ped_keys],
                 dim=1,
             )  # (num_envs, num_semantic_layers, 80, 80)
 
-        if SPACE.LastActionSpace in self._observation_space_manager:
+        if self._has_last_action:
             last_action = observations[SPACE.LastActionSpace.name].squeeze(
                 1
             )  # (num_envs, 3)
@@ -501,6 +451,19 @@ class RESNET_MID_FUSION_EXTRACTOR_1(RosnavBaseExtractor):
         """
         return self._forward_impl(**self._get_input(observations))
 
+    def fuse_for_inference(self) -> "RESNET_MID_FUSION_EXTRACTOR_1":
+        """
+        Switch to evaluation mode, fold the batch normalization layers into the preceding
+        convolutions and group the resulting Conv2d-ReLU pairs into ``ConvReLU2d`` modules.
+
+        Only meant for deployment, the fused extractor can neither be trained
+        nor loaded from or saved to a checkpoint of the unfused architecture.
+
+        Returns:
+            RESNET_MID_FUSION_EXTRACTOR_1: The fused feature extractor.
+        """
+        return fuse_conv_relu(fuse_conv_bn(self.eval()))
+
 
 class DRL_VO_NAV_EXTRACTOR(RESNET_MID_FUSION_EXTRACTOR_1):
     """
@@ -518,6 +481,7 @@ class DRL_VO_NAV_EXTRACTOR(RESNET_MID_FUSION_EXTRACTOR_1):
         width_per_group (int, optional): The width of each group in the ResNet architecture. Defaults to 64.
         replace_stride_with_dilation (List[bool], optional): Whether to replace stride with dilation in each block of the ResNet architecture. Defaults to None.
         norm_layer (nn.Module, optional): The normalization layer to use in the ResNet architecture. Defaults to nn.BatchNorm2d.
+        use_stem_maxpool (bool, optional): Whether to apply the stride-1 3x3 max pooling after the stem convolution. It does not change the feature map size. Defaults to True.
     """
 
     REQUIRED_OBSERVATIONS = [
@@ -558,6 +522,7 @@ class RESNET_MID_FUSION_EXTRACTOR_2(RESNET_MID_FUSION_EXTRACTOR_1):
         width_per_group (int, optional): The width of each group in the ResNet architecture. Defaults to 64.
         replace_stride_with_dilation (List[bool], optional): Whether to replace stride with dilation in each block of the ResNet architecture. Defaults to None.
         norm_layer (nn.Module, optional): The normalization layer to use in the ResNet architecture. Defaults to nn.BatchNorm2d.
+        use_stem_maxpool (bool, optional): Whether to apply the stride-1 3x3 max pooling after the stem convolution. It does not change the feature map size. Defaults to True.
     """
 
     REQUIRED_OBSERVATIONS = [
@@ -569,9 +534,13 @@ class RESNET_MID_FUSION_EXTRACTOR_2(RESNET_MID_FUSION_EXTRACTOR_1):
         SPACE.DistAngleToSubgoalSpace,
     ]
 
-    def _setup_network(self, inplanes: int = 64):
+    def _setup_network(self, inplanes: int = 64, conv1: Optional[nn.Conv2d] = None):
         """
         Sets up the network architecture for feature extraction.
+
+        Args:
+            inplanes (int, optional): The number of channels after the stem. Defaults to 64.
+            conv1 (nn.Conv2d, optional): Replacement for the second stem convolution. Defaults to None.
         """
         ################## ped_pos net model: ###################
         if len(self._layers) < 4:
@@ -605,12 +574,25 @@ class RESNET_MID_FUSION_EXTRACTOR_2(RESNET_MID_FUSION_EXTRACTOR_1):
         self.bn1_1 = self._norm_layer(self.inplanes)
         self.relu1_1 = nn.ReLU(inplace=True)
 
-        self.conv1 = nn.Conv2d(
-            self.inplanes, self.inplanes, kernel_size=3, stride=1, padding=1, bias=False
+        self.conv1 = (
+            conv1
+            if conv1 is not None
+            else nn.Conv2d(
+                self.inplanes,
+                self.inplanes,
+                kernel_size=3,
+                stride=1,
+                padding=1,
+                bias=False,
+            )
         )
         self.bn1 = self._norm_layer(self.inplanes)
         self.relu = nn.ReLU(inplace=True)
-        self.maxpool = nn.MaxPool2d(kernel_size=3, stride=1, padding=1)
+        self.maxpool = (
+            nn.MaxPool2d(kernel_size=3, stride=1, padding=1)
+            if self._use_stem_maxpool
+            else nn.Identity()
+        )
         self.layer1 = self._make_layer(self._block, 64, self._layers[0])
         self.layer2 = self._make_layer(
             self._block,
@@ -627,85 +609,11 @@ class RESNET_MID_FUSION_EXTRACTOR_2(RESNET_MID_FUSION_EXTRACTOR_1):
             dilate=self._replace_stride_with_dilation[1],
         )
 
-        self.conv2_2 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=256,
-                out_channels=128,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(128),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=128,
-                out_channels=128,
-                kernel_size=(3, 3),
-                stride=(1, 1),
-                padding=(1, 1),
-            ),
-            nn.BatchNorm2d(128),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=128,
-                out_channels=256,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(256),
-        )
-        self.downsample2 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=128,
-                out_channels=256,
-                kernel_size=(1, 1),
-                stride=(2, 2),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(256),
-        )
-        self.relu2 = nn.ReLU(inplace=True)
-
-        self.conv3_2 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=512,
-                out_channels=256,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(256),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=256,
-                out_channels=256,
-                kernel_size=(3, 3),
-                stride=(1, 1),
-                padding=(1, 1),
-            ),
-            nn.BatchNorm2d(256),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=256,
-                out_channels=512,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(512),
-        )
-        self.downsample3 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=64,
-                out_channels=512,
-                kernel_size=(1, 1),
-                stride=(4, 4),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(512),
-        )
-        self.relu3 = nn.ReLU(inplace=True)
+        self.conv2_2 = bottleneck_branch(256, 128, 256)
+        self.downsample2 = downsample_branch(128, 256, 2)
+
+        self.conv3_2 = bottleneck_branch(512, 256, 512)
+        self.downsample3 = downsample_branch(64, 512, 4)
 
         # self.layer4 = self._make_layer(block, 512, layers[3], stride=2,
         #                               dilate=replace_stride_with_dilation[2])
@@ -719,18 +627,8 @@ class RESNET_MID_FUSION_EXTRACTOR_2(RESNET_MID_FUSION_EXTRACTOR_1):
             dilate=self._replace_stride_with_dilation[2],
         )
 
-        self.conv4_2 = deepcopy(self.conv3_2)
-        self.downsample4 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=256,
-                out_channels=512,
-                kernel_size=(1, 1),
-                stride=(2, 2),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(512),
-        )
-        self.relu4 = nn.ReLU(inplace=True)
+        self.conv4_2 = bottleneck_branch(512, 256, 512)
+        self.downsample4 = downsample_branch(256, 512, 2)
 
         self.avgpool = nn.AdaptiveAvgPool2d((1, 1))
 
@@ -787,23 +685,23 @@ class RESNET_MID_FUSION_EXTRACTOR_2(RESNET_MID_FUSION_EXTRACTOR_1):
         identity1 = self.downsample4(x)  # in: 256, out: 512
 
         x = self.conv2_2(x)  # in: 256, out: 256
-        x += identity2
-        x = self.relu2(x)
+        x = add_relu_(x, identity2)
+        del identity2
 
         x = self.layer3(x)  # in: 256, out: 512
 
         x = self.conv3_2(x)  # in: 512, out: 512
-        x += identity1  # 512
-        x = self.relu3(x)
+        x = add_relu_(x, identity1)  # 512
+        del identity1
 
         x = self.layer4(x)
 
         x = self.conv4_2(x)  # in: 512, out: 512
-        x += identity3  # 512
-        x = self.relu4(x)
+        x = add_relu_(x, identity3)  # 512
+        del identity3
 
         x = self.avgpool(x)
-        fusion_out = x.squeeze(-1).squeeze(-1)
+        fusion_out = x.flatten(1)
         ###### End of fusion net ######
 
         ###### Start of goal net #######
@@ -838,6 +736,7 @@ class RESNET_MID_FUSION_EXTRACTOR_3(RESNET_MID_FUSION_EXTRACTOR_2):
         width_per_group (int, optional): The width of each group in the ResNet architecture. Defaults to 64.
         replace_stride_with_dilation (List[bool], optional): Whether to replace stride with dilation in each block of the ResNet architecture. Defaults to None.
         norm_layer (nn.Module, optional): The normalization layer to use in the ResNet architecture. Defaults to nn.BatchNorm2d.
+        use_stem_maxpool (bool, optional): Whether to apply the stride-1 3x3 max pooling after the stem convolution. It does not change the feature map size. Defaults to True.
     """
 
     REQUIRED_OBSERVATIONS = [
@@ -876,14 +775,15 @@ class RESNET_MID_FUSION_EXTRACTOR_5(RESNET_MID_FUSION_EXTRACTOR_3):
     def _setup_network(self):
         if len(self._layers) < 4:
             self._layers.append(1)
-        super()._setup_network()
-        self.conv1 = nn.Conv2d(
-            self.num_pedestrian_feature_maps + 1,
-            64,
-            kernel_size=3,
-            stride=1,
-            padding=1,
-            bias=False,
+        super()._setup_network(
+            conv1=nn.Conv2d(
+                self.num_pedestrian_feature_maps + 1,
+                64,
+                kernel_size=3,
+                stride=1,
+                padding=1,
+                bias=False,
+            )
         )
 
     def _forward_impl(
@@ -930,23 +830,23 @@ class RESNET_MID_FUSION_EXTRACTOR_5(RESNET_MID_FUSION_EXTRACTOR_3):
         identity1 = self.downsample4(x)  # in: 256, out: 512
 
         x = self.conv2_2(x)  # in: 256, out: 256
-        x += identity2
-        x = self.relu2(x)
+        x = add_relu_(x, identity2)
+        del identity2
 
         x = self.layer3(x)  # in: 256, out: 512
 
         x = self.conv3_2(x)  # in: 512, out: 512
-        x += identity1  # 512
-        x = self.relu3(x)
+        x = add_relu_(x, identity1)  # 512
+        del identity1
 
         x = self.layer4(x)
 
         x = self.conv4_2(x)  # in: 512, out: 512
-        x += identity3  # 512
-        x = self.relu4(x)
+        x = add_relu_(x, identity3)  # 512
+        del identity3
 
         x = self.avgpool(x)
-        fusion_out = x.squeeze(-1).squeeze(-1)
+        fusion_out = x.flatten(1)
         ###### End of fusion net ######
 
         ###### Start of goal net #######
@@ -983,6 +883,7 @@ class RESNET_MID_FUSION_EXTRACTOR_6(RESNET_MID_FUSION_EXTRACTOR_3):
         width_per_group (int, optional): The width of each group in the ResNet architecture. Defaults to 64.
         replace_stride_with_dilation (List[bool], optional): Whether to replace stride with dilation in each block of the ResNet architecture. Defaults to None.
         norm_layer (nn.Module, optional): The normalization layer to use in the ResNet architecture. Defaults to nn.BatchNorm2d.
+        use_stem_maxpool (bool, optional): Whether to apply the stride-1 3x3 max pooling after the stem convolution. It does not change the feature map size. Defaults to True.
     """
 
     REQUIRED_OBSERVATIONS = [
@@ -997,14 +898,16 @@ class RESNET_MID_FUSION_EXTRACTOR_6(RESNET_MID_FUSION_EXTRACTOR_3):
 
     def _setup_network(self):
         inplanes = 128
-        super()._setup_network(inplanes=inplanes)
-        self.conv1 = nn.Conv2d(
-            self.num_pedestrian_feature_maps + 1,
-            inplanes,
-            kernel_size=3,
-            stride=1,
-            padding=1,
-            bias=False,
+        super()._setup_network(
+            inplanes=inplanes,
+            conv1=nn.Conv2d(
+                self.num_pedestrian_feature_maps + 1,
+                inplanes,
+                kernel_size=3,
+                stride=1,
+                padding=1,
+                bias=False,
+            ),
         )
 
     def _forward_impl(
@@ -1043,17 +946,17 @@ class RESNET_MID_FUSION_EXTRACTOR_6(RESNET_MID_FUSION_EXTRACTOR_3):
         identity1 = self.downsample4(x)  # in: 256, out: 512
 
         x = self.conv2_2(x)  # in: 256, out: 256
-        x += identity2
-        x = self.relu2(x)
+        x = add_relu_(x, identity2)
+        del identity2
 
         x = self.layer3(x)  # in: 256, out: 512
 
         x = self.conv3_2(x)  # in: 512, out: 512
-        x += identity1  # 512
-        x = self.relu3(x)
+        x = add_relu_(x, identity1)  # 512
+        del identity1
 
         x = self.avgpool(x)
-        fusion_out = x.squeeze(-1).squeeze(-1)
+        fusion_out = x.flatten(1)
         ###### End of fusion net ######
 
         ###### Start of goal net #######
@@ -1121,7 +1024,11 @@ class DRL_VO_NAV_EXTRACTOR_TEST(DRL_VO_NAV_EXTRACTOR):
         )
         self.bn1 = self._norm_layer(self.inplanes)
         self.relu = nn.ReLU(inplace=True)
-        self.maxpool = nn.MaxPool2d(kernel_size=3, stride=1, padding=1)
+        self.maxpool = (
+            nn.MaxPool2d(kernel_size=3, stride=1, padding=1)
+            if self._use_stem_maxpool
+            else nn.Identity()
+        )
         self.layer1 = self._make_layer(self._block, 64, self._layers[0])
         self.layer2 = self._make_layer(
             self._block,
@@ -1138,119 +1045,14 @@ class DRL_VO_NAV_EXTRACTOR_TEST(DRL_VO_NAV_EXTRACTOR):
             dilate=self._replace_stride_with_dilation[1],
         )
 
-        self.conv2_2 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=256,
-                out_channels=128,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(128),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=128,
-                out_channels=128,
-                kernel_size=(3, 3),
-                stride=(1, 1),
-                padding=(1, 1),
-            ),
-            nn.BatchNorm2d(128),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=128,
-                out_channels=256,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(256),
-        )
-        self.downsample2 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=128,
-                out_channels=256,
-                kernel_size=(1, 1),
-                stride=(2, 2),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(256),
-        )
-        self.relu2 = nn.ReLU(inplace=True)
-
-        self.conv3_2 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=512,
-                out_channels=256,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(256),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=256,
-                out_channels=256,
-                kernel_size=(3, 3),
-                stride=(1, 1),
-                padding=(1, 1),
-            ),
-            nn.BatchNorm2d(256),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=256,
-                out_channels=512,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(512),
-        )
-        self.downsample3 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=256,
-                out_channels=512,
-                kernel_size=(1, 1),
-                stride=(2, 2),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(512),
-        )
-        self.relu3 = nn.ReLU(inplace=True)
-
-        self.conv4_2 = nn.Sequential(
-            nn.Conv2d(
-                in_channels=1024,
-                out_channels=512,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(512),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=512,
-                out_channels=512,
-                kernel_size=(3, 3),
-                stride=(1, 1),
-                padding=(1, 1),
-            ),
-            nn.BatchNorm2d(512),
-            nn.ReLU(inplace=True),
-            nn.Conv2d(
-                in_channels=512,
-                out_channels=1024,
-                kernel_size=(1, 1),
-                stride=(1, 1),
-                padding=(0, 0),
-            ),
-            nn.BatchNorm2d(1024),
-        )
-        self.downsample4 = nn.Sequential(
-            nn.Conv2d(64, 1024, kernel_size=(1, 1), stride=(8, 8), padding=(0, 0)),
-            nn.BatchNorm2d(1024),
-        )
-        self.relu4 = nn.ReLU(inplace=True)
+        self.conv2_2 = bottleneck_branch(256, 128, 256)
+        self.downsample2 = downsample_branch(128, 256, 2)
+
+        self.conv3_2 = bottleneck_branch(512, 256, 512)
+        self.downsample3 = downsample_branch(256, 512, 2)
+
+        self.conv4_2 = bottleneck_branch(1024, 512, 1024)
+        self.downsample4 = downsample_branch(64, 1024, 8)
 
         self.layer4 = self._make_layer(
             self._block,
@@ -1311,23 +1113,23 @@ class DRL_VO_NAV_EXTRACTOR_TEST(DRL_VO_NAV_EXTRACTOR):
         identity3 = self.downsample3(x)
 
         x = self.conv2_2(x)
-        x += identity2
-        x = self.relu2(x)
+        x = add_relu_(x, identity2)
+        del identity2
 
         x = self.layer3(x)
 
         x = self.conv3_2(x)
-        x += identity3
-        x = self.relu3(x)
+        x = add_relu_(x, identity3)
+        del identity3
 
         x = self.layer4(x)
 
         x = self.conv4_2(x)
-        x += identity4
-        x = self.relu4(x)
+        x = add_relu_(x, identity4)
+        del identity4
 
         x = self.avgpool(x)
-        fusion_out = x.squeeze(-1).squeeze(-1)
+        fusion_out = x.flatten(1)
         ###### End of fusion net ######
 
         ###### Start of goal net #######
@@ -1385,18 +1187,18 @@ class _LaserTest(RESNET_MID_FUSION_EXTRACTOR_1):
         x = self.layer2(x)
 
         x = self.conv2_2(x)
-        x += identity2
-        x = self.relu2(x)
+        x = add_relu_(x, identity2)
+        del identity2
 
         x = self.layer3(x)
         # x = self.layer4(x)
 
         x = self.conv3_2(x)
-        x += identity3
-        x = self.relu3(x)
+        x = add_relu_(x, identity3)
+        del identity3
 
         x = self.avgpool(x)
-        fusion_out = x.squeeze(-1).squeeze(-1)
+        fusion_out = x.flatten(1)
         ###### End of fusion net ######
 
         ###### Start of goal net #######
@@ -1459,23 +1261,23 @@ class _LaserTest_deep(DRL_VO_NAV_EXTRACTOR_TEST):
         identity3 = self.downsample3(x)
 
         x = self.conv2_2(x)
-        x += identity2
-        x = self.relu2(x)
+        x = add_relu_(x, identity2)
+        del identity2
 
         x = self.layer3(x)
 
         x = self.conv3_2(x)
-        x += identity3
-        x = self.relu3(x)
+        x = add_relu_(x, identity3)
+        del identity3
 
         x = self.layer4(x)
 
         x = self.conv4_2(x)
-        x += identity4
-        x = self.relu4(x)
+        x = add_relu_(x, identity4)
+        del identity4
 
         x = self.avgpool(x)
-        fusion_out = x.squeeze(-1).squeeze(-1)
+        fusion_out = x.flatten(1)
         ###### End of fusion net ######
 
         ###### Start of goal net #######
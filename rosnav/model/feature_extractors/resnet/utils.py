@@ -1,4 +1,7 @@
+import torch
 from torch import nn
+from torch.ao.nn.intrinsic import ConvReLU2d
+from torch.nn.utils.fusion import fuse_conv_bn_eval, fuse_linear_bn_eval
 
 
 def conv3x3(in_planes, out_planes, stride=1, groups=1, dilation=1) -> nn.Conv2d:
@@ -40,3 +43,165 @@ def conv1x1(in_planes, out_planes, stride=1) -> nn.Conv2d:
         nn.Conv2d: 1x1 convolutional layer with specified parameters
     """
     return nn.Conv2d(in_planes, out_planes, kernel_size=1, stride=stride, bias=False)
+
+
+def add_relu_(x: torch.Tensor, identity: torch.Tensor) -> torch.Tensor:
+    """
+    In-place residual addition followed by an in-place ReLU
+
+    Written as a single elementwise expression, so that compiled graphs (``torch.compile``)
+    lower it to one fused kernel reading and writing the activation once.
+
+    Args:
+        x (torch.Tensor): Output of the residual branch, overwritten with the result
+        identity (torch.Tensor): Identity (shortcut) tensor
+
+    Returns:
+        torch.Tensor: ``relu(x + identity)``
+    """
+    return torch.relu_(x.add_(identity))
+
+
+def bottleneck_branch(in_planes, mid_planes, out_planes) -> nn.Sequential:
+    """
+    1x1 -> 3x3 -> 1x1 convolutional branch with batch normalization, as used next to the residual connections
+
+    Args:
+        in_planes (int): Number of input channels
+        mid_planes (int): Number of channels of the inner 3x3 convolution
+        out_planes (int): Number of output channels
+
+    Returns:
+        nn.Sequential: Conv2d, BatchNorm2d, ReLU, Conv2d, BatchNorm2d, ReLU, Conv2d, BatchNorm2d
+    """
+    return nn.Sequential(
+        nn.Conv2d(
+            in_planes, mid_planes, kernel_size=(1, 1), stride=(1, 1), padding=(0, 0)
+        ),
+        nn.BatchNorm2d(mid_planes),
+        nn.ReLU(inplace=True),
+        nn.Conv2d(
+            mid_planes, mid_planes, kernel_size=(3, 3), stride=(1, 1), padding=(1, 1)
+        ),
+        nn.BatchNorm2d(mid_planes),
+        nn.ReLU(inplace=True),
+        nn.Conv2d(
+            mid_planes, out_planes, kernel_size=(1, 1), stride=(1, 1), padding=(0, 0)
+        ),
+        nn.BatchNorm2d(out_planes),
+    )
+
+
+def downsample_branch(in_planes, out_planes, stride) -> nn.Sequential:
+    """
+    Strided 1x1 convolution with batch normalization, projecting an earlier activation onto a residual connection
+
+    Args:
+        in_planes (int): Number of input channels
+        out_planes (int): Number of output channels
+        stride (int): Stride of the convolution
+
+    Returns:
+        nn.Sequential: Conv2d, BatchNorm2d
+    """
+    return nn.Sequential(
+        nn.Conv2d(
+            in_planes,
+            out_planes,
+            kernel_size=(1, 1),
+            stride=(stride, stride),
+            padding=(0, 0),
+        ),
+        nn.BatchNorm2d(out_planes),
+    )
+
+
+def _fuse(layer: nn.Module, norm: nn.Module) -> nn.Module:
+    """
+    Fold an eval-mode batch normalization into the preceding layer.
+
+    Args:
+        layer (nn.Module): Convolutional or linear layer
+        norm (nn.Module): Batch normalization applied to the output of ``layer``
+
+    Returns:
+        nn.Module: The fused layer, or None if the pair cannot be fused
+    """
+    if getattr(norm, "running_mean", None) is None:
+        return None
+    if isinstance(layer, nn.Conv2d) and isinstance(norm, nn.BatchNorm2d):
+        return fuse_conv_bn_eval(layer, norm)
+    if isinstance(layer, nn.Linear) and isinstance(norm, nn.BatchNorm1d):
+        return fuse_linear_bn_eval(layer, norm)
+    return None
+
+
+def fuse_conv_bn(module: nn.Module) -> nn.Module:
+    """
+    Fold the batch normalization layers of a module in evaluation mode into the preceding layers.
+
+    In evaluation mode a batch normalization is a per-channel affine transformation, which
+    can be merged into the weights and bias of the convolution (or linear layer) before it.
+    Pairs are found inside ``nn.Sequential`` containers and as ``conv<suffix>`` / ``bn<suffix>``
+    attributes (e.g. in the Bottleneck blocks). Fused normalization layers are replaced by
+    ``nn.Identity``, hence the module's state dict changes and it must not be trained afterwards.
+
+    Args:
+        module (nn.Module): Module in evaluation mode
+
+    Returns:
+        nn.Module: The module with fused layers
+    """
+    for child in list(module.modules()):
+        if isinstance(child, nn.Sequential):
+            for idx in range(len(child) - 1):
+                fused = _fuse(child[idx], child[idx + 1])
+                if fused is not None:
+                    child[idx] = fused
+                    child[idx + 1] = nn.Identity()
+
+        for name, layer in list(child.named_children()):
+            if not name.startswith("conv"):
+                continue
+            norm_name = "bn" + name[len("conv") :]
+            fused = _fuse(layer, getattr(child, norm_name, None))
+            if fused is not None:
+                setattr(child, name, fused)
+                setattr(child, norm_name, nn.Identity())
+
+    return module
+
+
+def fuse_conv_relu(module: nn.Module) -> nn.Module:
+    """
+    Group each convolution followed by a ReLU inside ``nn.Sequential`` containers into a ``ConvReLU2d``.
+
+    Meant to run after ``fuse_conv_bn``, which turns Conv2d-BatchNorm2d-ReLU triplets into
+    Conv2d-Identity-ReLU. The grouping mainly serves FX graph mode quantization (``to_quantized``),
+    which maps ``ConvReLU2d`` to a single quantized convolution with activation. In eager mode
+    it is a no-op, ``ConvReLU2d`` just calls both modules. The replaced ReLU becomes an ``nn.Identity``.
+
+    Args:
+        module (nn.Module): Module in evaluation mode
+
+    Returns:
+        nn.Module: The module with grouped layers
+    """
+    for child in list(module.modules()):
+        if not isinstance(child, nn.Sequential) or isinstance(child, ConvReLU2d):
+            continue
+
+        for idx in range(len(child) - 1):
+            if type(child[idx]) is not nn.Conv2d:
+                continue
+            # skip identities left over from folded batch norms
+            next_idx = idx + 1
+            while next_idx < len(child) - 1 and isinstance(
+                child[next_idx], nn.Identity
+            ):
+                next_idx += 1
+            if type(child[next_idx]) is nn.ReLU:
+                child[idx] = ConvReLU2d(child[idx], child[next_idx])
+                child[next_idx] = nn.Identity()
+
+    return module
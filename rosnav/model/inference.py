@@ -0,0 +1,680 @@
+"""Inference-time optimizations applied to policies loaded for deployment"""
+
+import io
+from typing import Any, Callable, Dict, Iterable, Iterator, Sequence, Tuple, Union
+
+import numpy as np
+import torch as th
+from gymnasium import spaces
+from stable_baselines3.common.policies import BasePolicy
+from stable_baselines3.common.preprocessing import is_image_space, preprocess_obs
+from stable_baselines3.common.save_util import load_from_zip_file
+from stable_baselines3.common.torch_layers import MlpExtractor
+from stable_baselines3.common.utils import get_device, is_vectorized_observation
+from torch import nn
+
+_MLP_EXTRACTOR_NETS = ("shared_net", "policy_net", "value_net")
+_FEATURES_EXTRACTORS = (
+    "features_extractor",
+    "pi_features_extractor",
+    "vf_features_extractor",
+)
+
+
+def _tensors(inputs: Any) -> Iterator[th.Tensor]:
+    """Yield the tensors of (nested) dicts, tuples and lists in a fixed order."""
+    if isinstance(inputs, th.Tensor):
+        yield inputs
+    elif isinstance(inputs, dict):
+        for val in inputs.values():
+            yield from _tensors(val)
+    elif isinstance(inputs, (tuple, list)):
+        for val in inputs:
+            yield from _tensors(val)
+
+
+def _clone(inputs: Any) -> Any:
+    if isinstance(inputs, th.Tensor):
+        return inputs.clone()
+    if isinstance(inputs, dict):
+        return {key: _clone(val) for key, val in inputs.items()}
+    if isinstance(inputs, (tuple, list)):
+        return type(inputs)(_clone(val) for val in inputs)
+    return inputs
+
+
+class CUDAGraphModule(nn.Module):
+    """
+    Wraps a module and replays its forward pass from captured CUDA graphs.
+
+    A graph is captured on the first call with a new input signature (shapes, dtypes and
+    devices), after some warm-up iterations on a side stream. Later calls with the same
+    signature copy their inputs into the static input buffers, replay the graph and return
+    a copy of the static outputs, which removes the kernel launch overhead of the forward
+    pass. Inputs may be tensors or (nested) dicts, tuples and lists of tensors. Calls with
+    gradients enabled or with CPU tensors run the wrapped module eagerly.
+
+    Args:
+        module (nn.Module): The module to wrap, in evaluation mode.
+        warmup_iters (int, optional): The number of warm-up iterations before capturing. Defaults to 3.
+    """
+
+    def __init__(self, module: nn.Module, warmup_iters: int = 3):
+        super(CUDAGraphModule, self).__init__()
+        self.module = module
+        self._warmup_iters = warmup_iters
+
+        # signature -> (graph, static inputs, static outputs)
+        self._graphs = {}
+
+    def _capture(self, inputs: tuple) -> tuple:
+        static_inputs = _clone(inputs)
+
+        stream = th.cuda.Stream()
+        stream.wait_stream(th.cuda.current_stream())
+        with th.cuda.stream(stream):
+            for _ in range(self._warmup_iters):
+                self.module(*static_inputs)
+        th.cuda.current_stream().wait_stream(stream)
+
+        graph = th.cuda.CUDAGraph()
+        with th.cuda.graph(graph):
+            static_outputs = self.module(*static_inputs)
+        return graph, static_inputs, static_outputs
+
+    @staticmethod
+    def _get_signature(inputs: tuple) -> tuple:
+        return tuple((t.shape, t.dtype, t.device) for t in _tensors(inputs))
+
+    def forward(self, *inputs) -> Any:
+        if th.is_grad_enabled() or self.training:
+            return self.module(*inputs)
+
+        signature = CUDAGraphModule._get_signature(inputs)
+        if signature not in self._graphs:
+            if not all(t.is_cuda for t in _tensors(inputs)):
+                return self.module(*inputs)
+            self._graphs[signature] = self._capture(inputs)
+        graph, static_inputs, static_outputs = self._graphs[signature]
+
+        for static_input, val in zip(_tensors(static_inputs), _tensors(inputs)):
+            static_input.copy_(val, non_blocking=True)
+        graph.replay()
+        return _clone(static_outputs)
+
+
+class AutocastModule(nn.Module):
+    """
+    Wraps a module and runs its forward pass under ``torch.autocast`` with a reduced precision dtype.
+
+    Convolutions and matmuls then run in float16 or bfloat16 (Tensor Cores on GPU), while
+    the outputs are cast back to float32 for the following float32 layers of the policy.
+
+    Args:
+        module (nn.Module): The module to wrap.
+        dtype (th.dtype, optional): The autocast dtype. Defaults to th.bfloat16.
+    """
+
+    def __init__(self, module: nn.Module, dtype: th.dtype = th.bfloat16):
+        super(AutocastModule, self).__init__()
+        self.module = module
+        self._dtype = dtype
+
+        param = next(module.parameters(), None)
+        self._device_type = param.device.type if param is not None else "cpu"
+
+    def forward(self, *inputs) -> th.Tensor:
+        with th.autocast(device_type=self._device_type, dtype=self._dtype):
+            return self.module(*inputs).float()
+
+
+class OnnxRuntimeModule(nn.Module):
+    """
+    Runs an exported feature extractor with ONNX Runtime instead of PyTorch.
+
+    All graph optimizations of ONNX Runtime are enabled, which e.g. fuse the
+    Conv-BatchNorm-Add-ReLU sequences of the ResNet extractors. The observations
+    are passed as numpy arrays and the features are returned as tensors on ``device``.
+    Requires the optional ``onnxruntime`` package.
+
+    Args:
+        model (bytes): The serialized ONNX model.
+        device (th.device): The device to return the features on.
+        providers (Sequence[str], optional): The ONNX Runtime execution providers.
+            Defaults to ("CPUExecutionProvider",).
+    """
+
+    def __init__(
+        self,
+        model: bytes,
+        device: th.device,
+        providers: Sequence[str] = ("CPUExecutionProvider",),
+    ):
+        super(OnnxRuntimeModule, self).__init__()
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(model, options, providers=list(providers))
+        # observations not used by the extractor are no model inputs
+        self._input_names = [inp.name for inp in self._session.get_inputs()]
+        self._device = device
+
+    def forward(self, observations: Dict[str, th.Tensor]) -> th.Tensor:
+        feeds = {
+            name: observations[name].detach().cpu().numpy()
+            for name in self._input_names
+        }
+        return th.from_numpy(self._session.run(None, feeds)[0]).to(self._device)
+
+
+class PinnedObservationLoader:
+    """
+    Replacement for ``policy.obs_to_tensor`` that moves observations to the GPU asynchronously.
+
+    The observations are copied into pinned (page-locked) host buffers, which are kept per
+    observation key and reused as long as the shapes do not change, and are transferred
+    with ``non_blocking=True``. Only non-image observation spaces are supported, which
+    need no transposing.
+
+    Args:
+        policy (BasePolicy): The policy, on a CUDA device.
+    """
+
+    def __init__(self, policy: BasePolicy):
+        self._observation_space = policy.observation_space
+        self._device = policy.device
+        self._buffers: Dict[Any, th.Tensor] = {}
+        self._copied = None
+
+    def _to_device(self, key: Any, obs: np.ndarray) -> th.Tensor:
+        src = th.from_numpy(np.ascontiguousarray(obs))
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.shape != src.shape or buffer.dtype != src.dtype:
+            buffer = self._buffers[key] = th.empty_like(src).pin_memory()
+        buffer.copy_(src)
+        return buffer.to(self._device, non_blocking=True)
+
+    def __call__(self, observation: Any) -> Tuple[Any, bool]:
+        if self._copied is not None:
+            # the buffers must not be overwritten before the last transfer finished
+            self._copied.synchronize()
+
+        if isinstance(observation, dict):
+            vectorized_env = False
+            obs_tensor = {}
+            for key, obs in observation.items():
+                space = self._observation_space[key]
+                obs = np.asarray(obs)
+                vectorized_env = vectorized_env or is_vectorized_observation(obs, space)
+                obs_tensor[key] = self._to_device(key, obs.reshape((-1, *space.shape)))
+        else:
+            obs = np.asarray(observation)
+            vectorized_env = is_vectorized_observation(obs, self._observation_space)
+            obs_tensor = self._to_device(
+                None, obs.reshape((-1, *self._observation_space.shape))
+            )
+
+        self._copied = th.cuda.Event()
+        self._copied.record()
+        return obs_tensor, vectorized_env
+
+
+def replace_empty_nets(mlp_extractor: MlpExtractor) -> MlpExtractor:
+    """
+    Replace empty ``nn.Sequential`` networks of the MLP extractor with ``nn.Identity``.
+
+    SB3 creates empty containers for heads without layers (e.g. ``pi=[]``), which
+    still iterate over their children on every call.
+
+    Args:
+        mlp_extractor (MlpExtractor): The MLP extractor of the policy.
+
+    Returns:
+        MlpExtractor: The MLP extractor without empty networks.
+    """
+    for name in _MLP_EXTRACTOR_NETS:
+        net = getattr(mlp_extractor, name, None)
+        if isinstance(net, nn.Sequential) and len(net) == 0:
+            setattr(mlp_extractor, name, nn.Identity())
+    return mlp_extractor
+
+
+def specialize_mlp_extractor(mlp_extractor: MlpExtractor) -> MlpExtractor:
+    """
+    Replace the networks of the MLP extractor with ``torch.fx`` generated modules.
+
+    Symbolic tracing emits a straight-line ``forward`` with the concrete layer order of
+    the loaded architecture, instead of iterating over the ``nn.Sequential`` children
+    on every call. The generated modules can be scripted or compiled afterwards.
+
+    Args:
+        mlp_extractor (MlpExtractor): The MLP extractor of the policy.
+
+    Returns:
+        MlpExtractor: The MLP extractor with generated networks.
+    """
+    for name in _MLP_EXTRACTOR_NETS:
+        net = getattr(mlp_extractor, name, None)
+        if isinstance(net, nn.Sequential):
+            setattr(mlp_extractor, name, th.fx.symbolic_trace(net))
+    return mlp_extractor
+
+
+def compile_mlp_extractor(mlp_extractor: MlpExtractor) -> MlpExtractor:
+    """
+    Compile the shared, policy and value networks of the MLP extractor with ``torch.compile``.
+
+    The networks are compiled separately, since SB3 calls ``forward_actor`` and
+    ``forward_critic`` on their own during prediction and value estimation.
+    "reduce-overhead" is used as rollout inference runs on small, fixed-size batches
+    and benefits from CUDA graph capture.
+
+    Args:
+        mlp_extractor (MlpExtractor): The MLP extractor of the policy.
+
+    Returns:
+        MlpExtractor: The MLP extractor with compiled networks.
+    """
+    for name in _MLP_EXTRACTOR_NETS:
+        net = getattr(mlp_extractor, name, None)
+        if net is not None:
+            setattr(
+                mlp_extractor,
+                name,
+                th.compile(net, mode="reduce-overhead", dynamic=False),
+            )
+    return mlp_extractor
+
+
+def script_mlp_extractor(mlp_extractor: MlpExtractor) -> MlpExtractor:
+    """
+    Script and freeze the shared, policy and value networks of the MLP extractor with TorchScript.
+
+    The networks only consist of ``nn.Sequential`` containers of linear layers and
+    activations, hence they can be scripted without changes. Freezing inlines the
+    weights, so the networks must not be trained afterwards.
+
+    Args:
+        mlp_extractor (MlpExtractor): The MLP extractor of the policy in evaluation mode.
+
+    Returns:
+        MlpExtractor: The MLP extractor with scripted networks.
+    """
+    for name in _MLP_EXTRACTOR_NETS:
+        net = getattr(mlp_extractor, name, None)
+        if net is not None:
+            setattr(
+                mlp_extractor,
+                name,
+                th.jit.optimize_for_inference(th.jit.script(net)),
+            )
+    return mlp_extractor
+
+
+def _map_features_extractors(
+    policy: BasePolicy, fn: Callable[[nn.Module], nn.Module]
+) -> BasePolicy:
+    """Replace each (possibly shared) features extractor of the policy once by ``fn(extractor)``."""
+    replaced = {}
+    for name in _FEATURES_EXTRACTORS:
+        extractor = getattr(policy, name, None)
+        if extractor is None:
+            continue
+        if id(extractor) not in replaced:
+            replaced[id(extractor)] = fn(extractor)
+        setattr(policy, name, replaced[id(extractor)])
+    return policy
+
+
+def _sample_observations(policy: BasePolicy) -> Dict[str, th.Tensor]:
+    """Sample an observation of the policy and preprocess it as the feature extractors receive it."""
+    observations, _ = policy.obs_to_tensor(policy.observation_space.sample())
+    return preprocess_obs(
+        observations,
+        policy.observation_space,
+        normalize_images=policy.normalize_images,
+    )
+
+
+def _recorded_observations(
+    policy: BasePolicy,
+    observations: Union[str, Iterable[Dict[str, np.ndarray]]],
+    batch_size: int = 64,
+) -> Iterator[Dict[str, th.Tensor]]:
+    """
+    Yield recorded observations preprocessed as the feature extractors receive them.
+
+    A path is read with ``np.load`` from a ``.npz`` file holding one array per observation
+    key, with the recorded observations stacked along the first axis, and split into
+    batches of ``batch_size`` observations.
+    """
+    if isinstance(observations, str):
+        with np.load(observations) as recorded:
+            recorded = dict(recorded)
+        num_observations = len(next(iter(recorded.values())))
+        observations = (
+            {key: val[start : start + batch_size] for key, val in recorded.items()}
+            for start in range(0, num_observations, batch_size)
+        )
+
+    for obs in observations:
+        obs_tensor, _ = policy.obs_to_tensor(obs)
+        yield preprocess_obs(
+            obs_tensor,
+            policy.observation_space,
+            normalize_images=policy.normalize_images,
+        )
+
+
+def script_features_extractors(policy: BasePolicy) -> BasePolicy:
+    """
+    Replace the feature extractors of the policy providing ``to_scripted`` with their TorchScript versions.
+
+    The extractors are traced once with a sampled observation. A features extractor
+    shared between actor and critic is only traced once.
+
+    Args:
+        policy (BasePolicy): The policy in evaluation mode.
+
+    Returns:
+        BasePolicy: The policy with scripted feature extractors.
+    """
+    observations = _sample_observations(policy)
+
+    def _script(extractor: nn.Module) -> nn.Module:
+        if not hasattr(extractor, "to_scripted"):
+            return extractor
+        with th.no_grad():
+            return extractor.to_scripted(observations)
+
+    return _map_features_extractors(policy, _script)
+
+
+def onnxruntime_features_extractors(policy: BasePolicy) -> BasePolicy:
+    """
+    Replace the feature extractors of the policy providing ``export_onnx`` with ONNX Runtime sessions.
+
+    The extractors are exported in memory with a sampled observation and run on
+    the CPU execution provider, which suits CPU-only deployments.
+
+    Args:
+        policy (BasePolicy): The policy in evaluation mode.
+
+    Returns:
+        BasePolicy: The policy with ONNX Runtime feature extractors.
+    """
+    observations = _sample_observations(policy)
+
+    def _export(extractor: nn.Module) -> nn.Module:
+        if not hasattr(extractor, "export_onnx"):
+            return extractor
+        buffer = io.BytesIO()
+        with th.no_grad():
+            extractor.export_onnx(buffer, observations)
+        return OnnxRuntimeModule(buffer.getvalue(), policy.device)
+
+    return _map_features_extractors(policy, _export)
+
+
+def quantize_features_extractors(
+    policy: BasePolicy,
+    calibration_observations: Union[str, Iterable[Dict[str, np.ndarray]]],
+) -> BasePolicy:
+    """
+    Replace the feature extractors of the policy providing ``to_quantized`` with INT8 quantized versions.
+
+    The activation ranges are calibrated on observations recorded while running the
+    agent, so that they match the deployed laser and pedestrian maps. The quantized
+    operators only run on the CPU, hence the whole policy is moved to the CPU first.
+
+    Args:
+        policy (BasePolicy): The policy in evaluation mode.
+        calibration_observations (Union[str, Iterable[Dict[str, np.ndarray]]]): The recorded observations,
+            either as path to a ``.npz`` file with one array per observation key, stacked along the
+            first axis, or as observation dicts (single or batched) as passed to ``predict``.
+
+    Returns:
+        BasePolicy: The policy with quantized feature extractors.
+    """
+    policy.to("cpu")
+
+    # materialized, as the iterable is consumed once per feature extractor
+    calibration_observations = list(
+        _recorded_observations(policy, calibration_observations)
+    )
+    if not calibration_observations:
+        raise ValueError(
+            "No recorded observations given to calibrate the INT8 quantization on."
+        )
+
+    def _quantize(extractor: nn.Module) -> nn.Module:
+        if not hasattr(extractor, "to_quantized"):
+            return extractor
+        return extractor.to_quantized(calibration_observations)
+
+    return _map_features_extractors(policy, _quantize)
+
+
+def compile_features_extractors(policy: BasePolicy) -> BasePolicy:
+    """
+    Compile the feature extractors of the policy with ``torch.compile``.
+
+    The convolutional extractors run at every step on fixed-size feature maps, hence
+    "reduce-overhead" is used as for the MLP extractor.
+
+    Args:
+        policy (BasePolicy): The policy in evaluation mode.
+
+    Returns:
+        BasePolicy: The policy with compiled feature extractors.
+    """
+    return _map_features_extractors(
+        policy,
+        lambda extractor: th.compile(extractor, mode="reduce-overhead", dynamic=False),
+    )
+
+
+def pin_observation_memory(policy: BasePolicy) -> BasePolicy:
+    """
+    Let the policy stage its observations in pinned memory before moving them to the GPU.
+
+    Skipped for policies on the CPU and for image observation spaces.
+
+    Args:
+        policy (BasePolicy): The loaded policy.
+
+    Returns:
+        BasePolicy: The policy.
+    """
+    observation_space = policy.observation_space
+    subspaces = (
+        observation_space.spaces.values()
+        if isinstance(observation_space, spaces.Dict)
+        else (observation_space,)
+    )
+    if policy.device.type != "cuda" or any(map(is_image_space, subspaces)):
+        return policy
+
+    policy.obs_to_tensor = PinnedObservationLoader(policy)
+    return policy
+
+
+def load_policy(
+    model_path: str, custom_objects: dict = None, device: str = "auto"
+) -> BasePolicy:
+    """
+    Load only the policy of a saved SB3 model.
+
+    ``PPO.load(...).policy`` sets up the whole algorithm, including the rollout
+    buffer and a randomly initialized policy, only to overwrite its weights
+    afterwards. Here the policy is built once from the saved (or custom) policy
+    kwargs and the saved weights are loaded into it.
+
+    Args:
+        model_path (str): The path to the saved model.
+        custom_objects (dict, optional): Objects replacing the saved ones, e.g. the policy kwargs. Defaults to None.
+        device (str, optional): The device to load the policy on. Defaults to "auto".
+
+    Returns:
+        BasePolicy: The loaded policy.
+    """
+    device = get_device(device)
+    data, params, _ = load_from_zip_file(
+        model_path, device=device, custom_objects=custom_objects
+    )
+
+    policy_kwargs = dict(data.get("policy_kwargs", {}))
+    policy_kwargs.pop("device", None)
+    # SB3 < 1.8 format, e.g. [dict(pi=[...], vf=[...])]
+    net_arch = policy_kwargs.get("net_arch")
+    if net_arch and isinstance(net_arch, list) and isinstance(net_arch[0], dict):
+        policy_kwargs["net_arch"] = net_arch[0]
+
+    policy = data["policy_class"](
+        data["observation_space"],
+        data["action_space"],
+        lambda _: 0.0,
+        use_sde=data.get("use_sde", False),
+        **policy_kwargs,
+    )
+    policy.load_state_dict(params["policy"])
+    return policy.to(device)
+
+
+def optimize_policy(
+    policy: BasePolicy,
+    compile_model: bool = False,
+    use_jit_script: bool = False,
+    use_cuda_graph: bool = False,
+    specialize_nets: bool = False,
+    allow_tf32: bool = False,
+    fuse_batch_norm: bool = False,
+    cudnn_benchmark: bool = False,
+    script_features_extractor: bool = False,
+    compile_features_extractor: bool = False,
+    channels_last: bool = False,
+    inference_dtype: str = None,
+    use_onnxruntime: bool = False,
+    int8_cpu: bool = False,
+    calibration_observations: Union[str, Iterable[Dict[str, np.ndarray]]] = None,
+    pin_memory: bool = False,
+) -> BasePolicy:
+    """
+    Apply inference-time optimizations to a loaded policy.
+
+    The policy is switched to evaluation mode and empty networks of the MLP extractor
+    are replaced by identities. All other optimizations are opt-in and only meant
+    for deployment, the optimized policy should not be trained further.
+
+    Args:
+        policy (BasePolicy): The loaded policy.
+        compile_model (bool, optional): Whether to compile the MLP extractor with ``torch.compile``. Defaults to False.
+        use_jit_script (bool, optional): Whether to script the MLP extractor with TorchScript.
+            Ignored if ``compile_model`` is set. Defaults to False.
+        use_cuda_graph (bool, optional): Whether to replay the MLP extractor networks and the feature
+            extractors from captured CUDA graphs. Each is skipped if it is already compiled with
+            ``torch.compile``, which captures CUDA graphs itself. Defaults to False.
+        specialize_nets (bool, optional): Whether to replace the MLP extractor networks with
+            ``torch.fx`` generated code before compiling or scripting. Defaults to False.
+        allow_tf32 (bool, optional): Whether to allow TensorFloat-32 for matmuls and convolutions
+            on Ampere or newer GPUs. This changes a process-wide setting. Defaults to False.
+        fuse_batch_norm (bool, optional): Whether to fold the batch normalization layers of feature
+            extractors providing ``fuse_for_inference`` into their convolutions. Defaults to False.
+        cudnn_benchmark (bool, optional): Whether to let cuDNN benchmark and pick the fastest convolution
+            algorithms for the fixed observation shapes. This changes a process-wide setting. Defaults to False.
+        script_features_extractor (bool, optional): Whether to replace feature extractors providing
+            ``to_scripted`` with frozen TorchScript modules. Defaults to False.
+        compile_features_extractor (bool, optional): Whether to compile the feature extractors with
+            ``torch.compile``. Ignored if ``script_features_extractor`` is set. Defaults to False.
+        channels_last (bool, optional): Whether to store the convolution weights of the feature extractors
+            in channels last (NHWC) memory format, which the activations then follow. Defaults to False.
+        inference_dtype (str, optional): Reduced precision dtype ("float16" or "bfloat16") to run the
+            feature extractors in via autocast. Ignored for INT8 quantized and ONNX Runtime feature extractors.
+            Defaults to None, i.e. float32.
+        use_onnxruntime (bool, optional): Whether to run feature extractors providing ``export_onnx``
+            with ONNX Runtime on the CPU. Requires ``onnxruntime``. Ignored if ``script_features_extractor``
+            is set, takes precedence over ``compile_features_extractor``. Defaults to False.
+        int8_cpu (bool, optional): Whether to quantize feature extractors providing ``to_quantized`` to INT8
+            for CPU inference, which moves the whole policy to the CPU. Requires ``calibration_observations``.
+            Takes precedence over all other feature extractor options. Defaults to False.
+        calibration_observations (Union[str, Iterable[Dict[str, np.ndarray]]], optional): Recorded observations
+            to calibrate the INT8 quantization on, see ``quantize_features_extractors``. Defaults to None.
+        pin_memory (bool, optional): Whether to copy the observations to the GPU from pinned host
+            buffers with non-blocking transfers. Skipped for policies on the CPU. Defaults to False.
+
+    Returns:
+        BasePolicy: The optimized policy.
+    """
+    if int8_cpu and calibration_observations is None:
+        raise ValueError(
+            "int8_cpu requires calibration_observations recorded from the deployed agent."
+        )
+
+    policy.set_training_mode(False)
+    mlp_extractor = policy.mlp_extractor
+
+    if allow_tf32:
+        th.backends.cuda.matmul.allow_tf32 = True
+        th.backends.cudnn.allow_tf32 = True
+
+    if cudnn_benchmark:
+        th.backends.cudnn.benchmark = True
+
+    if fuse_batch_norm:
+        for module in list(policy.modules()):
+            if hasattr(module, "fuse_for_inference"):
+                module.fuse_for_inference()
+
+    if channels_last:
+        _map_features_extractors(
+            policy, lambda extractor: extractor.to(memory_format=th.channels_last)
+        )
+
+    # INT8 and ONNX Runtime extractors bring their own precision, autocast does not apply
+    autocast_extractors = True
+    if int8_cpu:
+        quantize_features_extractors(policy, calibration_observations)
+        autocast_extractors = False
+    elif script_features_extractor:
+        script_features_extractors(policy)
+    elif use_onnxruntime:
+        onnxruntime_features_extractors(policy)
+        autocast_extractors = False
+    elif compile_features_extractor:
+        compile_features_extractors(policy)
+
+    if inference_dtype is not None and autocast_extractors:
+        dtype = getattr(th, inference_dtype)
+        _map_features_extractors(
+            policy, lambda extractor: AutocastModule(extractor, dtype).eval()
+        )
+
+    replace_empty_nets(mlp_extractor)
+
+    if specialize_nets:
+        specialize_mlp_extractor(mlp_extractor)
+
+    if compile_model:
+        compile_mlp_extractor(mlp_extractor)
+    elif use_jit_script:
+        script_mlp_extractor(mlp_extractor)
+
+    if use_cuda_graph and th.cuda.is_available():
+        if not compile_model:
+            for name in _MLP_EXTRACTOR_NETS:
+                net = getattr(mlp_extractor, name, None)
+                if net is not None:
+                    setattr(mlp_extractor, name, CUDAGraphModule(net).eval())
+        if not int8_cpu and (
+            script_features_extractor
+            or not (use_onnxruntime or compile_features_extractor)
+        ):
+            _map_features_extractors(
+                policy, lambda extractor: CUDAGraphModule(extractor).eval()
+            )
+
+    if pin_memory:
+        pin_observation_memory(policy)
+
+    return policy
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 
 from ..base_space_encoder import BaseSpaceEncoder
@@ -63,7 +65,14 @@ class ReducedLaserWrapper(BaseEncoderWrapper):
         """
         if x >= len(laserbeams):
             return laserbeams
-        indices = np.round(np.linspace(0, len(laserbeams) - 1, x)).astype(int)[:x]
         if type(laserbeams) == tuple:
             laserbeams = np.array(laserbeams)
-        return laserbeams[indices]
+        return laserbeams[_beam_indices(len(laserbeams), x)]
+
+
+@lru_cache(maxsize=8)
+def _beam_indices(num_beams: int, x: int) -> np.ndarray:
+    # the beam selection only depends on the scan size, so it is computed once per size
+    indices = np.round(np.linspace(0, num_beams - 1, x)).astype(int)[:x]
+    indices.flags.writeable = False
+    return indices
@@ -55,10 +55,11 @@ class RosnavSpaceManager:
         ns = Namespace(ns)
 
         self._stacked = rospy.get_param_cached("rl_agent/frame_stacking/enabled")
+        self._reduce_num_beams = rospy.get_param_cached("laser/reduce_num_beams")
         self._laser_num_beams = (
             rospy.get_param_cached("laser/num_beams")
-            if not rospy.get_param("laser/reduce_num_beams")
-            else rospy.get_param("laser/reduced_num_laser_beams")
+            if not self._reduce_num_beams
+            else rospy.get_param_cached("laser/reduced_num_laser_beams")
         )
         self._laser_max_range = rospy.get_param_cached("laser/range")
         self._radius = rospy.get_param_cached(str(ns("robot_radius")))
@@ -113,10 +114,10 @@ class RosnavSpaceManager:
             observation_kwargs=_observation_kwargs,
         )
 
-        if rospy.get_param("laser/reduce_num_beams"):
+        if self._reduce_num_beams:
             self._encoder = ReducedLaserWrapper(self._encoder, self._laser_num_beams)
 
-        if rospy.get_param("record_feature_maps", False):
+        if rospy.get_param_cached("record_feature_maps", False):
             self._encoder = FeatureMapRecorderWrapper(
                 encoder=self._encoder, save_every_x_obs=4
             )
@@ -1,30 +1,37 @@
 import rospy
-import math
 import os
 
 VALID_CONFIG_NAMES = ["hyperparameters.json", "training_config.yaml"]
 
 REDUCTION_FACTOR = 3
 
+# Read once at import, instead of once per encoder entry and per lasers_to_adapted call
+_NUM_BEAMS = rospy.get_param(os.path.join(rospy.get_namespace(), "laser/num_beams"))
+_REDUCED_NUM_BEAMS = rospy.get_param(
+    os.path.join(rospy.get_namespace(), "laser/reduced_num_laser_beams"), _NUM_BEAMS
+)
+
+
+def _reduce_num_beams(num_beams: int) -> int:
+    # integer ceil(num_beams / REDUCTION_FACTOR)
+    return (num_beams + REDUCTION_FACTOR - 1) // REDUCTION_FACTOR
+
+
 RosnavEncoder = {
     "DefaultEncoder": {
-        "lasers": rospy.get_param(
-            os.path.join(rospy.get_namespace(), "laser/num_beams")
-        ),
+        "lasers": _NUM_BEAMS,
         "meta": 2 + 3,  # Goal + Vel,
         "lasers_to_adapted": lambda x: x,
     },
     "StackedEncoder": {
-        "lasers": rospy.get_param(
-            os.path.join(rospy.get_namespace(), "laser/num_beams")
-        ),
+        "lasers": _NUM_BEAMS,
         "meta": 2 + 3,  # Goal + Vel,
         "lasers_to_adapted": lambda x: x,
     },
     "ReducedEncoder": {
-        "lasers": math.ceil(rospy.get_param("laser/num_beams") / REDUCTION_FACTOR),
+        "lasers": _reduce_num_beams(_NUM_BEAMS),
         "meta": 2 + 3,  # Goal + Vel
-        "lasers_to_adapted": lambda x: math.ceil(x / REDUCTION_FACTOR),
+        "lasers_to_adapted": _reduce_num_beams,
     },
     "UniformEncoder": {
         "lasers": 1200,
@@ -32,23 +39,13 @@ RosnavEncoder = {
         "maxVelocity": {"x": [-5, 5], "y": [-5, 5], "angular": [-10, 10]},
     },
     "ReducedLaserEncoder": {
-        "lasers": rospy.get_param(
-            os.path.join(rospy.get_namespace(), "laser/reduced_num_laser_beams"),
-            rospy.get_param(os.path.join(rospy.get_namespace(), "laser/num_beams")),
-        ),
+        "lasers": _REDUCED_NUM_BEAMS,
         "meta": 2 + 3,  # Goal + Vel
-        "lasers_to_adapted": lambda _: rospy.get_param(
-            os.path.join(rospy.get_namespace(), "laser/reduced_num_laser_beams")
-        ),
+        "lasers_to_adapted": lambda _: _REDUCED_NUM_BEAMS,
     },
     "StackedReducedLaserEncoder": {
-        "lasers": rospy.get_param(
-            os.path.join(rospy.get_namespace(), "laser/reduced_num_laser_beams"),
-            rospy.get_param(os.path.join(rospy.get_namespace(), "laser/num_beams")),
-        ),
+        "lasers": _REDUCED_NUM_BEAMS,
         "meta": 2 + 3,  # Goal + Vel,
-        "lasers_to_adapted": lambda _: rospy.get_param(
-            os.path.join(rospy.get_namespace(), "laser/reduced_num_laser_beams")
-        ),
+        "lasers_to_adapted": lambda _: _REDUCED_NUM_BEAMS,
     },
 }
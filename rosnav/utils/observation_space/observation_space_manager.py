@@ -1,5 +1,6 @@
 from typing import Any, Dict, List, Type, Union
 
+import numpy as np
 from gymnasium import spaces
 from rl_utils.utils.observation_collector import ObservationDict
 from rosnav.utils.observation_space import EncodedObservationDict
@@ -87,7 +88,7 @@ class ObservationSpaceManager:
             EncodedObservation: The encoded observation.
         """
         return {
-            name: space.encode_observation(observation, **kwargs)
+            name: _to_float32(space.encode_observation(observation, **kwargs))
             for name, space in self._space_containers.items()
         }
 
@@ -112,3 +113,13 @@ class ObservationSpaceManager:
             Iterator: An iterator over the observation space containers.
         """
         return iter(self._space_containers.values())
+
+
+def _to_float32(encoding: np.ndarray) -> np.ndarray:
+    """
+    Cast float64 encodings to float32 once at the environment boundary, so the
+    policy does not receive double precision observations.
+    """
+    if isinstance(encoding, np.ndarray) and encoding.dtype == np.float64:
+        return encoding.astype(np.float32)
+    return encoding
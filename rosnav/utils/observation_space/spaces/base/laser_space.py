@@ -20,16 +20,19 @@ class LaserScanSpace(BaseObservationSpace):
     Attributes:
         _num_beams (int): The number of laser beams.
         _max_range (float): The maximum range of the laser.
+        _out_shape (tuple): The shape of the encoded observation.
     """
 
     name = "LASER"
     required_observations = [LaserCollector]
+    _KEY = LaserCollector.name
 
     def __init__(
         self, laser_num_beams: int, laser_max_range: float, *args, **kwargs
     ) -> None:
         self._num_beams = laser_num_beams
         self._max_range = laser_max_range
+        self._out_shape = (1, laser_num_beams)
         super().__init__(*args, **kwargs)
 
     def get_gym_space(self) -> spaces.Space:
@@ -59,4 +62,7 @@ class LaserScanSpace(BaseObservationSpace):
         Returns:
             ndarray: The encoded laser scan observation.
         """
-        return observation[LaserCollector.name][np.newaxis, :]
+        scan = observation[self._KEY]
+        if scan.dtype != np.float32 or not scan.flags["C_CONTIGUOUS"]:
+            scan = np.ascontiguousarray(scan, dtype=np.float32)
+        return scan.reshape(self._out_shape)
@@ -81,6 +81,37 @@ class BaseFeatureMapSpace(BaseObservationSpace):
         )
         return x, y
 
+    def _scatter_to_map(self, values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """
+        Write values into an empty feature map at the map indices of their positions.
+
+        Vectorized equivalent of calling `_get_map_index` for each position. Positions
+        outside of the feature map are skipped.
+
+        Args:
+            values (np.ndarray): The values to write.
+            positions (np.ndarray): The positions of the values, one row per value.
+
+        Returns:
+            np.ndarray: The feature map.
+        """
+        feature_map = np.zeros((self._feature_map_size, self._feature_map_size))
+
+        num_entries = min(len(values), len(positions))
+        if num_entries == 0:
+            return feature_map
+
+        positions = np.asarray(positions, dtype=float)[:num_entries, :2]
+        indices = (positions / self._roi_in_m * self._feature_map_size).astype(int) + (
+            self._feature_map_size // 2
+        )
+        valid = np.all((indices >= 0) & (indices < self._feature_map_size), axis=1)
+
+        feature_map[indices[valid, 0], indices[valid, 1]] = np.asarray(values)[
+            :num_entries
+        ][valid]
+        return feature_map
+
     def _get_semantic_map(
         self,
         semantic_data: SemanticLayerCollector.data_class,
@@ -117,16 +148,9 @@ class BaseFeatureMapSpace(BaseObservationSpace):
                 )
                 relative_pos = get_relative_pos_to_robot(robot_pose, ped_points)
 
-            for data, pos in zip(
-                semantic_data.points,
-                relative_pos,
-            ):
-                index = self._get_map_index(pos)
-                if (
-                    0 <= index[0] < self.feature_map_size
-                    and 0 <= index[1] < self.feature_map_size
-                ):
-                    pos_map[index] = data.evidence
+            pos_map = self._scatter_to_map(
+                [data.evidence for data in semantic_data.points], relative_pos
+            )
         except Exception as e:
             rospy.logwarn(e)
 
@@ -81,7 +81,6 @@ class PedestrianSocialStateSpace(BaseFeatureMapSpace):
         Returns:
             np.ndarray: The semantic map.
         """
-        social_state_map = np.zeros((self.feature_map_size, self.feature_map_size))
         social_states = list(
             map(
                 lambda x: int(x.evidence) >> 8,
@@ -89,16 +88,10 @@ class PedestrianSocialStateSpace(BaseFeatureMapSpace):
             )
         )
 
-        if social_states is not None and relative_pos is not None:
-            for state, pos in zip(social_states, relative_pos):
-                index = self._get_map_index(pos)
-                if (
-                    0 <= index[0] < self.feature_map_size
-                    and 0 <= index[1] < self.feature_map_size
-                ):
-                    social_state_map[index] = state
+        if relative_pos is None:
+            return np.zeros((self.feature_map_size, self.feature_map_size))
 
-        return social_state_map
+        return self._scatter_to_map(social_states, relative_pos)
 
     @BaseObservationSpace.apply_normalization
     def encode_observation(
@@ -68,7 +68,7 @@ class PedestrianVelXSpace(BaseFeatureMapSpace):
             low=self._min_speed,
             high=self._max_speed,
             shape=(self._feature_map_size, self._feature_map_size),
-            dtype=float,
+            dtype=np.float32,
         )
 
     def _get_semantic_map(
@@ -90,18 +90,10 @@ class PedestrianVelXSpace(BaseFeatureMapSpace):
         Returns:
             np.ndarray: Semantic map representing the x velocity of pedestrians.
         """
-        x_vel_map = np.zeros((self.feature_map_size, self.feature_map_size))
-
-        if relative_x_vel is not None and relative_pos is not None:
-            for vel_x, pos in zip(relative_x_vel, relative_pos):
-                index = self._get_map_index(pos)
-                if (
-                    0 <= index[0] < self.feature_map_size
-                    and 0 <= index[1] < self.feature_map_size
-                ):
-                    x_vel_map[index] = vel_x
-
-        return x_vel_map
+        if relative_x_vel is None or relative_pos is None:
+            return np.zeros((self.feature_map_size, self.feature_map_size))
+
+        return self._scatter_to_map(relative_x_vel, relative_pos)
 
     @BaseObservationSpace.apply_normalization
     def encode_observation(
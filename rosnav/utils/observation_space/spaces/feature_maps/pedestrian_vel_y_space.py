@@ -61,7 +61,7 @@ class PedestrianVelYSpace(BaseFeatureMapSpace):
             low=self._min_speed,
             high=self._max_speed,
             shape=(self._feature_map_size, self._feature_map_size),
-            dtype=float,
+            dtype=np.float32,
         )
 
     def _get_semantic_map(
@@ -83,18 +83,10 @@ class PedestrianVelYSpace(BaseFeatureMapSpace):
         Returns:
             np.ndarray: Semantic map representing the x velocity of pedestrians.
         """
-        y_vel_map = np.zeros((self.feature_map_size, self.feature_map_size))
-
-        if relative_y_vel is not None and relative_pos is not None:
-            for vel_y, pos in zip(relative_y_vel, relative_pos):
-                index = self._get_map_index(pos)
-                if (
-                    0 <= index[0] < self.feature_map_size
-                    and 0 <= index[1] < self.feature_map_size
-                ):
-                    y_vel_map[index] = vel_y
-
-        return y_vel_map
+        if relative_y_vel is None or relative_pos is None:
+            return np.zeros((self.feature_map_size, self.feature_map_size))
+
+        return self._scatter_to_map(relative_y_vel, relative_pos)
 
     @BaseObservationSpace.apply_normalization
     def encode_observation(
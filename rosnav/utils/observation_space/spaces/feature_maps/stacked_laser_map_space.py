@@ -1,5 +1,3 @@
-from collections import deque
-
 import numpy as np
 import rospy
 from gymnasium import spaces
@@ -28,13 +26,14 @@ class StackedLaserMapSpace(BaseFeatureMapSpace):
         **kwargs: Arbitrary keyword arguments.
 
     Attributes:
-        _laser_queue (deque): A queue to store the laser scans.
+        _laser_stack (np.ndarray): A ring buffer storing the last laser scans.
+        _laser_head (int): The row of the newest laser scan in the ring buffer.
         _laser_stack_size (int): The size of the laser stack.
 
     Methods:
         _reset_laser_stack(laser_scan: np.ndarray): Resets the laser stack with zeros.
         _process_laser_scan(laser_scan: np.ndarray, done: bool) -> np.ndarray: Processes the laser scan and returns the feature map.
-        _build_laser_map(laser_queue: deque) -> np.ndarray: Builds the laser map from the laser queue.
+        _build_laser_map(laser_stack: np.ndarray) -> np.ndarray: Builds the laser map from the stacked laser scans.
         get_gym_space() -> spaces.Space: Returns the gym space for the feature map.
         encode_observation(observation: dict, *args, **kwargs) -> ndarray: Encodes the observation into a feature map.
 
@@ -52,7 +51,10 @@ class StackedLaserMapSpace(BaseFeatureMapSpace):
         *args,
         **kwargs,
     ) -> None:
-        self._laser_queue = deque()
+        self._laser_stack = None
+        self._ordered_laser_stack = None
+        self._laser_head = 0
+        self._pool_starts = self._pool_sizes = None
         self._laser_stack_size = laser_stack_size
         self._default_reward_info = {}
         super().__init__(
@@ -62,6 +64,10 @@ class StackedLaserMapSpace(BaseFeatureMapSpace):
             *args,
             **kwargs,
         )
+        # pooled scans, interleaving the min and avg pooling of each scan in the stack
+        self._scan_avg = np.empty(
+            (2 * laser_stack_size, feature_map_size), dtype=np.float32
+        )
 
     def _reset_laser_stack(self, laser_scan: np.ndarray):
         """
@@ -71,7 +77,22 @@ class StackedLaserMapSpace(BaseFeatureMapSpace):
             laser_scan (np.ndarray): The laser scan.
 
         """
-        self._laser_queue = deque([np.zeros_like(laser_scan)] * self._laser_stack_size)
+        self._laser_stack = np.zeros(
+            (self._laser_stack_size, len(laser_scan)), dtype=np.float32
+        )
+        # the laser scans ordered from newest to oldest
+        self._ordered_laser_stack = np.empty_like(self._laser_stack)
+        self._laser_head = 0
+
+        # beam counts not divisible by the feature map size are pooled over unequal bins
+        num_beams = len(laser_scan)
+        if num_beams % self._feature_map_size == 0:
+            self._pool_starts = self._pool_sizes = None
+        else:
+            edges = np.linspace(0, num_beams, self._feature_map_size + 1)
+            edges = edges.astype(np.intp)
+            self._pool_starts = edges[:-1]
+            self._pool_sizes = np.maximum(np.diff(edges), 1).astype(np.float32)
 
     def _process_laser_scan(
         self, laser_scan: LaserCollector.data_class, done: DoneObservation.data_class
@@ -87,62 +108,65 @@ class StackedLaserMapSpace(BaseFeatureMapSpace):
             np.ndarray: The feature map.
 
         """
-        if type(laser_scan) is not np.ndarray:
-            return np.zeros((self._feature_map_size * self._feature_map_size,))
+        if not isinstance(laser_scan, np.ndarray):
+            return np.zeros(self.shape, dtype=np.float32)
+
+        if laser_scan.ndim != 1 or laser_scan.size == 0:
+            rospy.logwarn(
+                f"[{rospy.get_name()}, {StackedLaserMapSpace.__name__}]: Unexpected laser scan shape {laser_scan.shape}. \n Cannot build laser map. Instead return empty map."
+            )
+            return np.zeros(self.shape, dtype=np.float32)
 
-        if len(self._laser_queue) == 0 or done:
+        if (
+            self._laser_stack is None
+            or done
+            or laser_scan.shape != self._laser_stack.shape[1:]
+        ):
             self._reset_laser_stack(laser_scan)
 
-        self._laser_queue.pop()
-        self._laser_queue.appendleft(laser_scan)
+        # the newest scan overwrites the oldest one
+        self._laser_head = (self._laser_head - 1) % self._laser_stack_size
+        self._laser_stack[self._laser_head] = laser_scan
 
-        laser_map = self._build_laser_map(self._laser_queue)
+        num_wrapped = self._laser_stack_size - self._laser_head
+        self._ordered_laser_stack[:num_wrapped] = self._laser_stack[self._laser_head :]
+        self._ordered_laser_stack[num_wrapped:] = self._laser_stack[: self._laser_head]
+
+        laser_map = self._build_laser_map(self._ordered_laser_stack)
 
         return laser_map
 
-    def _build_laser_map(self, laser_queue: deque) -> np.ndarray:
+    def _build_laser_map(self, laser_stack: np.ndarray) -> np.ndarray:
         """
-        Builds the laser map from the laser queue.
+        Builds the laser map from the stacked laser scans.
 
         Args:
-            laser_queue (deque): The laser queue.
+            laser_stack (np.ndarray): The laser scans, ordered from newest to oldest.
 
         Returns:
             np.ndarray: The laser map.
 
         """
-        try:
-            # laser_array = np.array(laser_queue)
-            # # laserstack list of 10 np.arrays of shape (720,)
-            # scan_avg = np.zeros((20, self._feature_map_size))
-            # # horizontal stacking of the pooling operations
-            # # min pooling over every 9th entry
-            # scan_avg[::2, :] = np.min(
-            #     laser_array.reshape(10, self._feature_map_size, 9), axis=2
-            # )
-            # # avg pooling over every 9th entry
-            # scan_avg[1::2, :] = np.mean(
-            #     laser_array.reshape(10, self._feature_map_size, 9), axis=2
-            # )
-
-            # scan_avg_map = np.tile(scan_avg.ravel(), 4).reshape(
-            #     (self._feature_map_size, self._feature_map_size)
-            # )
-            temp = np.array(laser_queue, dtype=np.float32).flatten()
-            scan_avg = np.zeros((20, 80))
-            for n in range(10):
-                scan_tmp = temp[n * 720 : (n + 1) * 720]
-                for i in range(80):
-                    scan_avg[2 * n, i] = np.min(scan_tmp[i * 9 : (i + 1) * 9])
-                    scan_avg[2 * n + 1, i] = np.mean(scan_tmp[i * 9 : (i + 1) * 9])
-
-            scan_avg = scan_avg.reshape(1600)
-            scan_avg_map = np.tile(scan_avg, (4, 1)).reshape((80, 80))
-        except Exception as e:
-            rospy.logwarn(
-                f"[{rospy.get_name()}, {StackedLaserMapSpace.__name__}]: {e} \n Cannot build laser map. Instead return empty map."
+        scan_avg = self._scan_avg
+        if self._pool_starts is None:
+            laser_array = laser_stack.reshape(
+                self._laser_stack_size, self._feature_map_size, -1
+            )
+            # min pooling over bins of num_beams // feature_map_size entries
+            np.min(laser_array, axis=2, out=scan_avg[::2])
+            # avg pooling over the same bins
+            np.mean(laser_array, axis=2, out=scan_avg[1::2])
+        else:
+            np.minimum.reduceat(
+                laser_stack, self._pool_starts, axis=1, out=scan_avg[::2]
             )
-            return np.zeros(self.get_gym_space().shape)
+            np.add.reduceat(laser_stack, self._pool_starts, axis=1, out=scan_avg[1::2])
+            scan_avg[1::2] /= self._pool_sizes
+
+        # the pooled scans are repeated until they fill the map
+        scan_avg_map = np.resize(
+            scan_avg, (self._feature_map_size, self._feature_map_size)
+        )
 
         return scan_avg_map
 
@@ -1,5 +1,7 @@
 import json
 import os
+from copy import deepcopy
+from functools import lru_cache
 from typing import Tuple
 
 import numpy as np
@@ -80,11 +82,17 @@ def load_json(file_path: str) -> dict:
         return json.load(file)
 
 
-def load_yaml(file_path: str) -> dict:
+@lru_cache(maxsize=8)
+def _load_yaml_cached(file_path: str, mtime: float) -> dict:
     with open(file_path) as file:
         return yaml.load(file, Loader=yaml.FullLoader)
 
 
+def load_yaml(file_path: str) -> dict:
+    # parsed files are cached per path and modification time, callers get a copy
+    return deepcopy(_load_yaml_cached(file_path, os.path.getmtime(file_path)))
+
+
 def make_mock_env(ns: str, agent_description) -> DummyVecEnv:
     import rl_utils.envs.flatland_gymnasium_env as flatland_gym_env
     import rl_utils.envs.arena_unity_env as arena_unity_env
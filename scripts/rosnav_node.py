@@ -12,6 +12,7 @@ from rl_utils.utils.observation_collector.observation_manager import Observation
 from rosnav.model.agent_factory import AgentFactory
 from rosnav.model.base_agent import PolicyType
 from rosnav.model.custom_sb3_policy import *
+from rosnav.model.inference import load_policy, optimize_policy
 from rosnav.rosnav_space_manager.rosnav_space_manager import RosnavSpaceManager
 from rosnav.srv import GetAction, GetActionResponse
 from rosnav.utils.constants import VALID_CONFIG_NAMES
@@ -25,8 +26,6 @@ from rosnav.utils.utils import (
     make_mock_env,
     wrap_vec_framestack,
 )
-from sb3_contrib import RecurrentPPO
-from stable_baselines3 import PPO
 from std_msgs.msg import Int16
 from task_generator.constants import Constants
 from rl_utils.topic import Namespace
@@ -336,12 +335,11 @@ class RosnavNode:
             )
         }
 
-        if not net_type or net_type == PolicyType.MULTI_INPUT:
-            self._recurrent_arch = False
-            return PPO.load(model_path, custom_objects=custom_objects).policy
-        else:
-            self._recurrent_arch = True
-            return RecurrentPPO.load(model_path, custom_objects=custom_objects).policy
+        self._recurrent_arch = bool(net_type) and net_type != PolicyType.MULTI_INPUT
+        policy = load_policy(model_path, custom_objects=custom_objects)
+
+        # Optional inference optimizations, e.g. {"compile_model": True}
+        return optimize_policy(policy, **rospy.get_param("~inference", {}))
 
     @staticmethod
     def _get_model_path(model_name):